@@ -2,16 +2,30 @@
 import serial
 import serial.tools.list_ports
 import time
-import random
 import csv
+import io
 import os
 import re
+import struct
 import sys
 import json
 import webbrowser
-from threading import Timer
+import queue
+import numpy as np
+import pandas as pd
+from threading import Timer, Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response
+
+# Numba es opcional: si está instalado compilamos el parser de bloques a
+# código nativo; si no, usamos la ruta vectorizada de NumPy.
+try:
+    from numba import njit
+
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    NUMBA_DISPONIBLE = False
 
 
 # --- 1. CONFIGURACIÓN E INICIALIZACIÓN ---
@@ -28,6 +42,23 @@ def resource_path(relative_path):
 
 app = Flask(__name__, template_folder=resource_path("templates"))
 
+# orjson es opcional: acelera ~10x la serialización de las respuestas
+# grandes (/api/scan y /api/history/load pueden llevar miles de muestras).
+try:
+    import orjson
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+except ImportError:
+    pass
+
 
 # --- LOGICA DE RUTAS PORTABLES ---
 
@@ -54,20 +85,34 @@ DEFAULT_CONFIG = {"puerto": "COM3", "velocidad": 9600, "simulacion": False}
 # --- GESTIÓN DE CONFIGURACIÓN ---
 
 
+# Cache en memoria del config: se relee del disco solo si cambió el mtime
+# (cada request del frontend llama cargar_config)
+_config_cache = None
+_config_mtime = None
+
+
 def cargar_config():
+    global _config_cache, _config_mtime
     if not os.path.exists(ARCHIVO_CONFIG):
         return DEFAULT_CONFIG
     try:
-        with open(ARCHIVO_CONFIG, "r") as f:
-            return json.load(f)
+        mtime = os.path.getmtime(ARCHIVO_CONFIG)
+        if _config_cache is None or mtime != _config_mtime:
+            with open(ARCHIVO_CONFIG, "r") as f:
+                _config_cache = json.load(f)
+            _config_mtime = mtime
+        return _config_cache
     except:
         return DEFAULT_CONFIG
 
 
 def guardar_config_json(nueva_config):
+    global _config_cache, _config_mtime
     try:
         with open(ARCHIVO_CONFIG, "w") as f:
             json.dump(nueva_config, f)
+        _config_cache = nueva_config
+        _config_mtime = os.path.getmtime(ARCHIVO_CONFIG)
         return True
     except:
         return False
@@ -125,6 +170,9 @@ EQUIPOS = {
     },
 }
 
+# EQUIPOS es estático: materializamos la lista de nombres una sola vez
+EQUIPOS_NOMBRES = list(EQUIPOS.keys())
+
 
 # --- 2. DRIVER DEL SENSOR ---
 
@@ -151,27 +199,53 @@ def parse_header_fecha_intervalo(buf):
         datetime: Fecha de inicio de la grabación.
         int: Intervalo en minutos entre muestras.
     """
-    data = bytearray(buf)
-    header = None
-    if len(data) >= 28 and data[0] == 0xD1 and data[1] == 0x1C:
-        header = data[:28]
-    else:
-        for i in range(len(data) - 27):
-            if data[i] == 0xD1 and data[i + 1] == 0x1C:
-                header = data[i : i + 28]
-                break
-
-    if header is None:
+    data = bytes(buf)
+    # bytes.find usa la búsqueda C de subcadenas, sin loop Python por byte
+    pos = data.find(b"\xd1\x1c")
+    if pos < 0 or len(data) - pos < 28:
         raise ValueError("Cabecera corrupta o no encontrada (Falta D1 1C)")
+    header = data[pos : pos + 28]
+
+    # Un solo unpack para los 7 campos en vez de 7 indexaciones sueltas
+    yy, mm, dd, hh, mi, ss, intervalo_min = struct.unpack_from("7B", header, 14)
+    return (
+        datetime(
+            2000 + bcd_to_int(yy),
+            bcd_to_int(mm),
+            bcd_to_int(dd),
+            bcd_to_int(hh),
+            bcd_to_int(mi),
+            bcd_to_int(ss),
+        ),
+        intervalo_min,
+    )
 
-    year = 2000 + bcd_to_int(header[14])
-    month = bcd_to_int(header[15])
-    day = bcd_to_int(header[16])
-    hour = bcd_to_int(header[17])
-    minute = bcd_to_int(header[18])
-    second = bcd_to_int(header[19])
-    intervalo_min = header[20]
-    return datetime(year, month, day, hour, minute, second), intervalo_min
+
+if NUMBA_DISPONIBLE:
+
+    @njit(cache=True)
+    def _parse_samples_nb(buf):
+        """Kernel numérico puro: recibe el bloque como uint8[::1] y devuelve
+        la matriz (N, 2) de temp/hum junto con la cantidad de muestras válidas."""
+        n = buf.shape[0] // 4
+        salida = np.empty((n, 2), dtype=np.int16)
+        fin = n
+        for i in range(n):
+            j = i * 4
+            t_raw = (int(buf[j]) << 8) | int(buf[j + 1])
+            h_raw = (int(buf[j + 2]) << 8) | int(buf[j + 3])
+            if (t_raw == 0x0000 or t_raw == 0xFFFF) and (
+                h_raw == 0x0000 or h_raw == 0xFFFF
+            ):
+                fin = i
+                break
+            salida[i, 0] = t_raw
+            salida[i, 1] = h_raw
+        return salida, fin
+
+    # Warm-up: compilamos en el import para que el primer escaneo del
+    # usuario no pague el costo del JIT.
+    _parse_samples_nb(np.zeros(4, dtype=np.uint8))
 
 
 def parse_samples(payload, offset=0):
@@ -182,33 +256,76 @@ def parse_samples(payload, offset=0):
     - Byte 2-3: Humedad Raw (Big Endian). Hum (%rH) = Raw / 10.0
 
     0x0000 o 0xFFFF indican fin de datos o espacio vacío.
+
+    Retorna:
+        (np.ndarray, np.ndarray): Arrays int16 de temp/hum en unidades crudas
+        (décimas); la conversión a float se hace en los bordes de salida.
     """
-    muestras = []
-    i = offset
-    while i + 4 <= len(payload):
-        t_raw = (payload[i] << 8) | payload[i + 1]
-        h_raw = (payload[i + 2] << 8) | payload[i + 3]
-        if t_raw in (0x0000, 0xFFFF) and h_raw in (0x0000, 0xFFFF):
+    # Recortamos a un múltiplo de 4 bytes para poder interpretar el buffer
+    # completo como pares uint16 big-endian de una sola vez.
+    largo_util = ((len(payload) - offset) // 4) * 4
+    if largo_util <= 0:
+        vacio = np.empty(0, dtype=np.int16)
+        return vacio, vacio
+
+    if NUMBA_DISPONIBLE:
+        buf = np.frombuffer(payload, dtype=np.uint8, count=largo_util, offset=offset)
+        salida, fin = _parse_samples_nb(buf)
+        return salida[:fin, 0].copy(), salida[:fin, 1].copy()
+
+    arr = np.frombuffer(payload, dtype=">u2", count=largo_util // 2, offset=offset)
+    arr = arr.reshape(-1, 2)
+    t_raw = arr[:, 0]
+    h_raw = arr[:, 1]
+
+    # Máscara branchless del terminador: en uint16, (x + 1) & 0xFFFE == 0
+    # se cumple solo para 0x0000 y 0xFFFF (el overflow de 0xFFFF + 1
+    # envuelve a 0), así que cada canal se chequea con un add + and + cmp
+    # en vez de dos comparaciones + or.
+    term = (((t_raw + np.uint16(1)) & np.uint16(0xFFFE)) == 0) & (
+        ((h_raw + np.uint16(1)) & np.uint16(0xFFFE)) == 0
+    )
+    if term.any():
+        fin = int(np.argmax(term))
+        t_raw = t_raw[:fin]
+        h_raw = h_raw[:fin]
+
+    return t_raw.astype(np.int16), h_raw.astype(np.int16)
+
+
+def leer_exacto(ser, n, timeout_s=1.0):
+    """
+    Lee exactamente n bytes del puerto, acumulando fragmentos hasta completar
+    el pedido o vencer el plazo. Reemplaza los sleeps fijos por bloque:
+    retorna apenas el dato está disponible en vez de esperar siempre 300 ms.
+    """
+    datos = bytearray()
+    limite = time.monotonic() + timeout_s
+    while len(datos) < n:
+        restante = limite - time.monotonic()
+        if restante <= 0:
             break
-        temp_c = t_raw / 10.0
-        hum_rh = h_raw / 10.0
-        muestras.append((temp_c, hum_rh))
-        i += 4
-    return muestras
+        ser.timeout = restante
+        chunk = ser.read(n - len(datos))
+        if chunk:
+            datos.extend(chunk)
+    return bytes(datos)
 
 
 def leer_bloque(ser, idx):
     cmd = bytes([0xD3, 0xDA, idx, 0x00, 0x00])
     ser.write(cmd)
     ser.flush()
-    time.sleep(0.3)
-    return ser.read(128)
+    return leer_exacto(ser, 128)
 
 
-def leer_sensor_real(puerto, velocidad):
+def leer_sensor_real(puerto, velocidad, progreso=None):
     """
     Establece comunicación con el datalogger Galileo THD 32000 y descarga la memoria completa.
 
+    progreso: callback opcional (bloques_leidos, total) para reportar avance
+    durante la descarga (usado por el stream SSE).
+
     Flujo de comunicación:
     1. Handshake: Enviar 0x5C, recibir ACK (16 bytes).
     2. Header Request: Enviar 0xAD 0xDA, recibir Header (64 bytes).
@@ -219,9 +336,8 @@ def leer_sensor_real(puerto, velocidad):
        - Parsear muestras del bloque.
 
     Retorna:
-        List[Dict]: Lista de muestras con fecha, temperatura y humedad.
+        Dict: Muestras en formato columnar (ver muestras_vacias).
     """
-    datos_procesados = []
     try:
         ser = serial.Serial(puerto, velocidad, timeout=1.0)
         ser.setDTR(True)
@@ -230,59 +346,111 @@ def leer_sensor_real(puerto, velocidad):
 
         ser.write(b"\x5c")
         ser.flush()
-        time.sleep(0.1)
-        ser.read(16)  # Handshake
+        leer_exacto(ser, 16, timeout_s=0.5)  # Handshake
 
         ser.write(b"\xad\xda")
         ser.flush()
-        time.sleep(0.3)  # Header
-        cabecera = ser.read(64)
+        cabecera = leer_exacto(ser, 64)  # Header
 
         try:
             dt_base, intervalo = parse_header_fecha_intervalo(cabecera)
         except Exception as e:
             ser.close()
             print(f"Error parseando fecha: {e}")
-            return []
-
+            return muestras_vacias()
+
+        # Buffer preallocado para la memoria completa (255 bloques x 32
+        # muestras): cada bloque se escribe por slice y al final se recorta,
+        # sin listas intermedias ni concatenate
+        max_muestras = 255 * 32
+        temps = np.empty(max_muestras, dtype=np.int16)
+        hums = np.empty(max_muestras, dtype=np.int16)
+        total = 0
         idx_bloque = 0
-        sample_index = 0
         while idx_bloque < 255:
             bloque = leer_bloque(ser, idx_bloque)
             if not bloque:
                 break
-            muestras_raw = parse_samples(bloque)
-            if not muestras_raw:
+            t_bloque, h_bloque = parse_samples(bloque)
+            if t_bloque.size == 0:
+                break
+            temps[total : total + t_bloque.size] = t_bloque
+            hums[total : total + h_bloque.size] = h_bloque
+            total += t_bloque.size
+            if progreso:
+                progreso(idx_bloque + 1, 255)
+            # Bloque parcial (terminador visto o lectura corta) = fin de los
+            # datos grabados: no tiene sentido pedir los bloques restantes.
+            if t_bloque.size < 32 or len(bloque) < 128:
                 break
-            for t, h in muestras_raw:
-                fecha_muestra = dt_base + timedelta(minutes=intervalo * sample_index)
-                datos_procesados.append(
-                    {
-                        "fecha": fecha_muestra.strftime("%Y-%m-%d %H:%M:%S"),
-                        "temp": round(t, 2),
-                        "hum": round(h, 2),
-                    }
-                )
-                sample_index += 1
             idx_bloque += 1
 
         ser.close()
-        return datos_procesados
+
+        if total == 0:
+            return muestras_vacias()
+
+        temps = temps[:total]
+        hums = hums[:total]
+
+        # Fechas vectorizadas: base + i * intervalo en una sola operación,
+        # formateadas de una pasada en vez de strftime por muestra.
+        fechas = np.datetime64(dt_base) + np.arange(temps.size) * np.timedelta64(
+            int(intervalo), "m"
+        )
+        fechas_txt = np.char.replace(fechas.astype("datetime64[s]").astype(str), "T", " ")
+
+        return {"fecha": fechas_txt.tolist(), "temp": temps, "hum": hums}
     except Exception as e:
         print(f"Error conexión ({puerto}): {e}")
-        return []
+        return muestras_vacias()
 
 
 # --- 3. LÓGICA AUXILIAR Y ESTADÍSTICAS ---
 
+# Modelo de datos interno: las muestras viajan por todo el pipeline en
+# formato columnar (SoA) — una lista de fechas y dos arrays NumPy — en vez
+# de una lista de dicts por muestra. temp/hum se guardan como int16 en
+# unidades crudas del sensor (décimas de °C / %rH): 4 bytes por muestra en
+# vez de 16, y la división por 10 se hace recién en los bordes. La lista
+# de dicts se arma una sola vez, en el borde JSON, con muestras_a_registros.
+
+
+def muestras_vacias():
+    return {
+        "fecha": [],
+        "temp": np.empty(0, dtype=np.int16),
+        "hum": np.empty(0, dtype=np.int16),
+    }
+
+
+def decimas_a_float(raw):
+    """Convierte una columna en unidades crudas (décimas) a float para salida"""
+    return np.asarray(raw, dtype=np.float64) / 10.0
+
+
+def muestras_a_registros(muestras):
+    """Convierte el formato columnar interno a la lista de dicts del frontend"""
+    temps = decimas_a_float(muestras["temp"]).tolist()
+    hums = decimas_a_float(muestras["hum"]).tolist()
+    return [
+        {"fecha": f, "temp": t, "hum": h}
+        for f, t, h in zip(muestras["fecha"], temps, hums)
+    ]
+
+
+# Compilado una sola vez a nivel módulo: evita recompilar/rebuscar en el
+# cache de re en cada guardado
+RE_NOMBRE_PROHIBIDO = re.compile(r'[\\/*?:"<>|]')
+
 
 def limpiar_nombre(nombre):
     """Elimina caracteres prohibidos en nombres de archivo de Windows/Linux"""
-    return re.sub(r'[\\/*?:"<>|]', "", nombre).strip()
+    return RE_NOMBRE_PROHIBIDO.sub("", nombre).strip()
 
 
-def guardar_csv_historico(datos, nombre_equipo, tag_usuario=""):
-    if not datos:
+def guardar_csv_historico(muestras, nombre_equipo, tag_usuario=""):
+    if not muestras["fecha"]:
         return None
 
     timestamp = datetime.now().strftime("%Y-%m-%d__%H-%M-%S")
@@ -298,13 +466,25 @@ def guardar_csv_historico(datos, nombre_equipo, tag_usuario=""):
     ruta_completa = os.path.join(CARPETA_HISTORIAL, nombre_archivo)
 
     try:
-        with open(ruta_completa, mode="w", newline="", encoding="utf-8") as f:
+        with open(
+            ruta_completa,
+            mode="w",
+            newline="",
+            encoding="utf-8",
+            buffering=64 * 1024,
+        ) as f:
             writer = csv.writer(f, delimiter=";")
             # Agregamos metadatos en la cabecera del CSV para referencia futura
             writer.writerow(["#", "Equipo:", nombre_equipo, "Tag:", tag_usuario])
             writer.writerow(["Fecha", "Temperatura", "Humedad"])
-            for d in datos:
-                writer.writerow([d["fecha"], d["temp"], d["hum"]])
+            # Una sola llamada writerows: evita el overhead por fila del loop
+            writer.writerows(
+                zip(
+                    muestras["fecha"],
+                    decimas_a_float(muestras["temp"]).tolist(),
+                    decimas_a_float(muestras["hum"]).tolist(),
+                )
+            )
         return nombre_archivo
     except Exception as e:
         print(f"Error archivo: {e}")
@@ -315,7 +495,6 @@ def guardar_csv_historico(datos, nombre_equipo, tag_usuario=""):
 
 
 def generar_datos_simulados(equipo):
-    datos = []
     base_temp = 20
     if "HELADERA" in equipo:
         base_temp = 5
@@ -323,43 +502,42 @@ def generar_datos_simulados(equipo):
         base_temp = -18
     elif "30-35" in equipo:
         base_temp = 32.5
-    fecha = datetime.now() - timedelta(hours=4)  # Simular 4 horas atrás
 
     # Generar 100 muestras (aprox una cada 15 min son 24hs, aqui hacemos menos para demo)
-    for i in range(100):
-        ruido = random.uniform(-1.0, 1.0)
-        temp = base_temp + ruido
-        hum = 60 + random.uniform(-5, 10)
-        datos.append(
-            {
-                "fecha": fecha.strftime("%Y-%m-%d %H:%M:%S"),
-                "temp": round(temp, 2),
-                "hum": round(hum, 2),
-            }
-        )
-        fecha += timedelta(minutes=15)
+    # Ruido y fechas vectorizados: un solo draw del RNG y un solo date_range
+    n = 100
+    rng = np.random.default_rng()
+    # Cuantizamos a décimas (unidades crudas del sensor) como el resto del pipeline
+    temps = np.round((base_temp + rng.uniform(-1.0, 1.0, n)) * 10).astype(np.int16)
+    hums = np.round((60 + rng.uniform(-5, 10, n)) * 10).astype(np.int16)
+
+    inicio = datetime.now() - timedelta(hours=4)  # Simular 4 horas atrás
+    fechas = np.datetime64(inicio) + np.arange(n) * np.timedelta64(15, "m")
+    fechas_txt = np.char.replace(fechas.astype("datetime64[s]").astype(str), "T", " ")
+
     time.sleep(1.0)
-    return datos
+    return {"fecha": fechas_txt.tolist(), "temp": temps, "hum": hums}
 
 
-def calcular_resumen(datos):
+def calcular_resumen(muestras):
     """Calcula estadísticas y metadatos de la misión"""
-    if not datos:
+    fechas = muestras["fecha"]
+    if not len(fechas):
         return {}
 
-    temps = [d["temp"] for d in datos]
-    hums = [d["hum"] for d in datos]
+    temps = decimas_a_float(muestras["temp"])
+    hums = decimas_a_float(muestras["hum"])
 
     return {
-        "inicio": datos[0]["fecha"],
-        "fin": datos[-1]["fecha"],
-        "muestras": len(datos),
-        "temp_max": max(temps),
-        "temp_min": min(temps),
-        "temp_prom": round(sum(temps) / len(temps), 2),
-        "hum_max": max(hums),
-        "hum_min": min(hums),
-        "hum_prom": round(sum(hums) / len(hums), 2),
+        "inicio": fechas[0],
+        "fin": fechas[-1],
+        "muestras": len(fechas),
+        "temp_max": float(temps.max()),
+        "temp_min": float(temps.min()),
+        "temp_prom": round(float(temps.mean()), 2),
+        "hum_max": float(hums.max()),
+        "hum_min": float(hums.min()),
+        "hum_prom": round(float(hums.mean()), 2),
         "unidad_temp": "°C",
         "unidad_hum": "%rH",
     }
@@ -369,9 +547,18 @@ def calcular_resumen(datos):
 
 
 # Ruta principal
+
+# El template solo depende de EQUIPOS (estático), así que renderizamos
+# una única vez y servimos el HTML cacheado
+_index_html = None
+
+
 @app.route("/")
 def index():
-    return render_template("index.html", equipos=EQUIPOS.keys())
+    global _index_html
+    if _index_html is None:
+        _index_html = render_template("index.html", equipos=EQUIPOS_NOMBRES)
+    return _index_html
 
 
 # Rutas de Configuración
@@ -415,7 +602,7 @@ def scan_sensor():
     else:
         muestras = leer_sensor_real(config["puerto"], config["velocidad"])
         origen_txt = f"Sensor ({config['puerto']})"
-        if not muestras:
+        if not muestras["fecha"]:
             return jsonify(
                 {
                     "mensaje": f"Error: No se detectó sensor en {config['puerto']}.",
@@ -428,41 +615,180 @@ def scan_sensor():
     archivo_guardado = guardar_csv_historico(muestras, equipo, tag)
     resumen = calcular_resumen(muestras)
 
-    msg = f"Lectura exitosa: {origen_txt}. {len(muestras)} registros."
+    msg = f"Lectura exitosa: {origen_txt}. {len(muestras['fecha'])} registros."
     if archivo_guardado:
         msg += " Guardado."
 
     return jsonify(
         {
             "mensaje": msg,
-            "datos": muestras,
+            "datos": muestras_a_registros(muestras),
             "archivo": archivo_guardado,
             "resumen": resumen,
         }
     )
 
 
+# Escaneo en segundo plano con progreso por SSE: /api/scan/start lanza el
+# hilo de lectura y /api/scan/stream va emitiendo eventos de avance por
+# bloque y el resultado final, sin bloquear un worker HTTP los ~segundos
+# que dura la descarga. Un solo escaneo a la vez: el puerto serie no
+# admite lectores concurrentes.
+_scan_lock = Lock()
+_scan_eventos = None
+
+
+def _ejecutar_scan(equipo, tag, eventos):
+    global _scan_eventos
+    try:
+        config = cargar_config()
+        if config["simulacion"]:
+            muestras = generar_datos_simulados(equipo)
+            origen_txt = "MODO SIMULACIÓN"
+        else:
+
+            def progreso(leidos, total):
+                eventos.put({"tipo": "progreso", "bloques": leidos, "total": total})
+
+            muestras = leer_sensor_real(config["puerto"], config["velocidad"], progreso)
+            origen_txt = f"Sensor ({config['puerto']})"
+            if not muestras["fecha"]:
+                eventos.put(
+                    {
+                        "tipo": "fin",
+                        "mensaje": f"Error: No se detectó sensor en {config['puerto']}.",
+                        "datos": [],
+                        "archivo": None,
+                    }
+                )
+                return
+
+        archivo_guardado = guardar_csv_historico(muestras, equipo, tag)
+        resumen = calcular_resumen(muestras)
+
+        msg = f"Lectura exitosa: {origen_txt}. {len(muestras['fecha'])} registros."
+        if archivo_guardado:
+            msg += " Guardado."
+
+        eventos.put(
+            {
+                "tipo": "fin",
+                "mensaje": msg,
+                "datos": muestras_a_registros(muestras),
+                "archivo": archivo_guardado,
+                "resumen": resumen,
+            }
+        )
+    except Exception as e:
+        # Cualquier falla también debe cerrar el stream con un evento
+        # terminal: sin esto el cliente no puede distinguir error de éxito
+        eventos.put(
+            {
+                "tipo": "fin",
+                "mensaje": f"Error durante el escaneo: {e}",
+                "datos": [],
+                "archivo": None,
+            }
+        )
+    finally:
+        eventos.put(None)  # Centinela: cierra el stream
+        # Limpiamos la cola ANTES de liberar el lock: un reconnect del
+        # EventSource tras el fin del escaneo cae en el 404 de scan_stream
+        # en vez de quedar bloqueado para siempre en una cola drenada
+        _scan_eventos = None
+        _scan_lock.release()
+
+
+@app.route("/api/scan/start", methods=["POST"])
+def scan_start():
+    global _scan_eventos
+    data = request.json
+    equipo = data.get("equipo", "GENERICO")
+    tag = data.get("tag", "")
+
+    if not _scan_lock.acquire(blocking=False):
+        return jsonify({"status": "error", "msg": "Ya hay un escaneo en curso"}), 409
+
+    _scan_eventos = queue.Queue()
+    Thread(target=_ejecutar_scan, args=(equipo, tag, _scan_eventos), daemon=True).start()
+    return jsonify({"status": "ok"})
+
+
+@app.route("/api/scan/stream")
+def scan_stream():
+    eventos = _scan_eventos
+    if eventos is None:
+        return jsonify({"error": "No hay escaneo en curso"}), 404
+
+    def generar():
+        while True:
+            ev = eventos.get()
+            if ev is None:
+                break
+            yield f"data: {json.dumps(ev)}\n\n"
+
+    return Response(generar(), mimetype="text/event-stream")
+
+
 # Rutas de Historial
+
+# Cache del listado: el scan + sort del directorio solo se rehace cuando
+# cambia el mtime de la carpeta (crear/borrar archivos lo actualiza)
+_historial_cache = None
+_historial_mtime = None
+
+
 @app.route("/api/history/list")
 def list_history():
-    archivos = []
-    if os.path.exists(CARPETA_HISTORIAL):
-        lista = sorted(
-            os.listdir(CARPETA_HISTORIAL),
-            key=lambda x: os.path.getmtime(os.path.join(CARPETA_HISTORIAL, x)),
-            reverse=True,
-        )
-        for f in lista:
-            if f.endswith(".csv"):
-                archivos.append(f)
-    return jsonify(archivos)
+    global _historial_cache, _historial_mtime
+    if not os.path.exists(CARPETA_HISTORIAL):
+        return jsonify([])
+    mtime = os.path.getmtime(CARPETA_HISTORIAL)
+    if _historial_cache is None or mtime != _historial_mtime:
+        # scandir entrega nombre + stat en una sola pasada (un syscall menos
+        # por archivo que listdir + getpath + getmtime)
+        entradas = [
+            (e.name, e.stat().st_mtime)
+            for e in os.scandir(CARPETA_HISTORIAL)
+            if e.name.endswith(".csv")
+        ]
+        entradas.sort(key=lambda par: par[1], reverse=True)
+        _historial_cache = [nombre for nombre, _ in entradas]
+        _historial_mtime = mtime
+    return jsonify(_historial_cache)
+
+
+def _cargar_csv_muestras(ruta):
+    """Lee un CSV del historial y devuelve las muestras en formato columnar"""
+    # Detectar si tiene cabecera de metadatos (inicia con #):
+    # formato nuevo = 2 filas a saltar, formato viejo = solo headers
+    with open(ruta, mode="r", encoding="utf-8") as f:
+        primera_linea = f.readline()
+    inicio_datos = 2 if primera_linea.startswith("#") else 1
+
+    # El parser C de pandas lee y convierte todo el archivo de una
+    # pasada, sin el loop fila a fila con float() por celda
+    df = pd.read_csv(
+        ruta,
+        sep=";",
+        skiprows=inicio_datos,
+        header=None,
+        names=["fecha", "temp", "hum"],
+        usecols=[0, 1, 2],
+        encoding="utf-8",
+    )
+    df = df.dropna()
+    return {
+        "fecha": df["fecha"].tolist(),
+        "temp": np.round(df["temp"].to_numpy() * 10).astype(np.int16),
+        "hum": np.round(df["hum"].to_numpy() * 10).astype(np.int16),
+    }
 
 
 # Ruta de carga de historial
 @app.route("/api/history/load/<filename>")
 def load_history(filename):
     ruta = os.path.join(CARPETA_HISTORIAL, filename)
-    datos = []
     try:
         # Lógica para parsear el nombre nuevo (con 4 partes) o viejo (con 3)
         # Formato: FECHA__HORA__EQUIPO__TAG.csv
@@ -476,30 +802,12 @@ def load_history(filename):
         if len(partes) >= 4:
             tag_detectado = partes[3]
 
-        with open(ruta, mode="r", encoding="utf-8") as f:
-            reader = csv.reader(f, delimiter=";")
-            filas = list(reader)
-
-            # Detectar si tiene cabecera de metadatos (inicia con #)
-            inicio_datos = 0
-            if filas and filas[0][0].startswith("#"):
-                inicio_datos = 2  # Saltamos metadatos y headers
-            else:
-                inicio_datos = 1  # Solo saltamos headers (formato viejo)
-
-            # Leer datos reales
-            for i in range(inicio_datos, len(filas)):
-                row = filas[i]
-                if len(row) >= 3:  # Asegurar que la fila es válida
-                    datos.append(
-                        {"fecha": row[0], "temp": float(row[1]), "hum": float(row[2])}
-                    )
-
-        resumen = calcular_resumen(datos)
+        muestras = _cargar_csv_muestras(ruta)
+        resumen = calcular_resumen(muestras)
 
         return jsonify(
             {
-                "datos": datos,
+                "datos": muestras_a_registros(muestras),
                 "equipo": equipo_detectado,
                 "tag": tag_detectado,  # <--- DEVOLVEMOS EL TAG
                 "resumen": resumen,
@@ -510,6 +818,47 @@ def load_history(filename):
         return jsonify({"error": str(e)}), 500
 
 
+# Ruta de exportación masiva: todo el historial en un único CSV combinado
+@app.route("/api/history/export")
+def export_history():
+    if not os.path.exists(CARPETA_HISTORIAL):
+        return jsonify({"error": "Sin historial"}), 404
+    nombres = sorted(n for n in os.listdir(CARPETA_HISTORIAL) if n.endswith(".csv"))
+    if not nombres:
+        return jsonify({"error": "Sin historial"}), 404
+
+    def cargar_seguro(nombre):
+        try:
+            return _cargar_csv_muestras(os.path.join(CARPETA_HISTORIAL, nombre))
+        except Exception as e:
+            print(f"Error leyendo {nombre}: {e}")
+            return muestras_vacias()
+
+    # La carga es I/O de disco + parser C de pandas (libera el GIL), así
+    # que leemos los archivos en paralelo en vez de uno por uno
+    with ThreadPoolExecutor(max_workers=min(8, len(nombres))) as pool:
+        cargados = list(pool.map(cargar_seguro, nombres))
+
+    salida = io.StringIO()
+    writer = csv.writer(salida, delimiter=";")
+    writer.writerow(["Archivo", "Fecha", "Temperatura", "Humedad"])
+    for nombre, muestras in zip(nombres, cargados):
+        writer.writerows(
+            zip(
+                [nombre] * len(muestras["fecha"]),
+                muestras["fecha"],
+                decimas_a_float(muestras["temp"]).tolist(),
+                decimas_a_float(muestras["hum"]).tolist(),
+            )
+        )
+
+    return Response(
+        salida.getvalue(),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment; filename=historial_completo.csv"},
+    )
+
+
 # Ruta de limites
 @app.route("/api/limits/<equipo>")
 def get_limits(equipo):
@@ -527,4 +876,11 @@ if __name__ == "__main__":
     if not os.environ.get("WERKZEUG_RUN_MAIN"):
         Timer(1, open_browser).start()
 
-    app.run(port=5000, debug=True)
+    try:
+        # Servidor WSGI de producción con workers threaded: las respuestas
+        # grandes no bloquean al resto de los requests como en el dev server
+        from waitress import serve
+
+        serve(app, host="127.0.0.1", port=5000, threads=4)
+    except ImportError:
+        app.run(port=5000, debug=True)